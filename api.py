@@ -1,25 +1,37 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response, Query, Request
 from pydantic import BaseModel
+import msgspec
 from enum import Enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 import uuid
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, UTC
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import sqlalchemy
-import os
+from sqlalchemy import text, bindparam, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import logging
-from huggingface_hub import HfApi, hf_hub_url
+from huggingface_hub import hf_hub_url
 import requests
-from functools import lru_cache
-from apscheduler.schedulers.background import BackgroundScheduler
+from requests.adapters import HTTPAdapter
+from anyio import to_thread
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from schema import ModelCategory, AssetType, DevicePlatform, LicenseType, PipelineConfig, MLModelAsset, MLModelDB, UserDB, ModelVersionDB
-from database import engine, get_session
-from sqlmodel import Field, Session, SQLModel, create_engine, select
+from database import get_session
+from sqlmodel import Field, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import selectinload, joinedload, raiseload, load_only
+from fastapi.concurrency import run_in_threadpool
 from auth import get_current_user
-from hf_sync import run_sync
+from hf_sync import run_sync, SyncAlreadyRunning, HF_API, card_str, map_hf_license_to_enum
 from config import get_settings
+from cache import TTLCache
 
 # get .env configs
 settings = get_settings()
@@ -28,6 +40,13 @@ settings = get_settings()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared outbound clients, built once so requests reuse warm keep-alive connections
+# HF_API (with the HF token, if set) comes from hf_sync so the API and the sync job share one client
+HF_SESSION = requests.Session()
+HF_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50))
+# shared workers for fanning out blocking HF calls (e.g. model_info per search candidate)
+HF_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hf")
+
 
 # user DTOs
 # user get
@@ -72,6 +91,12 @@ class ModelResponse(BaseModel):
     rating_weighted_avg: float
     total_ratings: int
     created_at: datetime
+    author_username: Optional[str] = None
+
+# model list get (one page, pass `next` back as `after` for the following page)
+class ModelPage(BaseModel):
+    items: List[ModelResponse]
+    next: Optional[uuid.UUID] = None
 
 # model post
 class ModelCreate(BaseModel):
@@ -136,11 +161,150 @@ class ModelVerUpdate(BaseModel):
 class HFImportRequest(BaseModel):
     hf_id: str # e.g. "google/mobilenet_v2_1.0_224"
 
+# msgspec mirror of ModelResponse for the GET hot paths
+# ModelResponse stays the documented response_model, this is only used to encode the body
+class ModelResponseStruct(msgspec.Struct, kw_only=True):
+    name: str
+    slug: Optional[str] = None
+    description: str | None
+    category: ModelCategory
+    id: uuid.UUID
+    author_id: uuid.UUID
+    tags: List[str]
+    task: str | None
+    license_type: LicenseType
+    total_download_count: int
+    rating_weighted_avg: float
+    total_ratings: int
+    created_at: datetime
+    author_username: Optional[str] = None
+
+# ModelResponse fields that are read straight off an MLModelDB row
+_MODEL_RESPONSE_FIELDS = tuple(f for f in ModelResponseStruct.__struct_fields__ if f != "author_username")
+
+# reused encoder, msgspec caches the per-type encoding plan on it
+_JSON_ENCODER = msgspec.json.Encoder()
+
+def to_model_response(model_fetch: MLModelDB) -> ModelResponseStruct:
+    """Build a ModelResponseStruct from a trusted DB row without re-validating it (author must be loaded)."""
+    row = model_fetch.__dict__
+    return ModelResponseStruct(
+        **{key: row[key] for key in _MODEL_RESPONSE_FIELDS if key in row},
+        author_username=model_fetch.author.username
+    )
+
+# rows per fetch/encode batch when streaming list endpoints
+STREAM_BATCH_SIZE = 100
+
+async def stream_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Wrap comma-joined JSON chunks in [ ] so a list can be streamed without building it in memory."""
+    yield b"["
+    separator = b""
+    async for chunk in chunks:
+        yield separator + chunk
+        separator = b","
+    yield b"]"
+
+# HTTP caching for single-object GETs
+CACHE_CONTROL = "private, max-age=30"
+
+def cached_json_response(request: Request, body: bytes | str) -> Response:
+    """
+    Return a JSON body with a weak ETag (hash of the body) and Cache-Control.
+    If the client already holds that version (If-None-Match), reply 304 with no body.
+    """
+    if isinstance(body, str):
+        body = body.encode()
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# PATCH-able columns, computed once (ids are never rewritten by an update)
+_MODEL_UPDATE_KEYS = frozenset(ModelUpdate.model_fields) - {"id"}
+_MODEL_VER_UPDATE_KEYS = frozenset(ModelVerUpdate.model_fields) - {"id", "model_id"}
+
+# PATCH-able JSONB columns, these hold nested DTOs that have to be dumped to plain dicts/lists
+_JSONB_UPDATE_KEYS = frozenset({"pipeline_spec", "assets"})
+
+# column names per table, for reading a row's values without a model_dump() walk
+_COLUMN_KEYS = {
+    MLModelDB: tuple(MLModelDB.__table__.columns.keys()),
+    ModelVersionDB: tuple(ModelVersionDB.__table__.columns.keys()),
+}
+
+def column_values(db_obj: SQLModel) -> Dict[str, Any]:
+    """Copy the column values that are set on a (not yet persisted) row straight from its __dict__."""
+    obj_dict = db_obj.__dict__
+    return {key: obj_dict[key] for key in _COLUMN_KEYS[type(db_obj)] if key in obj_dict}
+
+def update_values(update_dto: BaseModel, allowed_keys: frozenset) -> Dict[str, Any]:
+    """
+    Collect the fields the client actually sent in a PATCH DTO as UPDATE ... SET values.
+    Copies attributes directly instead of a full model_dump(), values must already be validated.
+    """
+    keys = update_dto.model_fields_set & allowed_keys
+    # only the nested JSONB values need dumping, everything else is copied as-is
+    nested_keys = keys & _JSONB_UPDATE_KEYS
+    values = update_dto.model_dump(include=nested_keys) if nested_keys else {}
+    for key in keys - nested_keys:
+        values[key] = getattr(update_dto, key)
+    return values
+
+# ==========================================
+# PRECOMPILED STATEMENTS
+# ==========================================
+# Built once at import with bind params, so handlers only supply values and
+# SQLAlchemy's compiled cache is hit instead of rebuilding the construct per request
+
+# only the columns ModelResponse renders (plus the author's username) are selected
+_MODEL_RESPONSE_COLUMNS = load_only(*(getattr(MLModelDB, field) for field in _MODEL_RESPONSE_FIELDS))
+
+# join the author in the same query, and raise on any other lazy load so N+1s don't creep back in
+_STMT_MODEL_BY_ID = select(MLModelDB).options(
+    _MODEL_RESPONSE_COLUMNS,
+    joinedload(MLModelDB.author).load_only(UserDB.username),
+    raiseload("*")
+).where(MLModelDB.id == bindparam("model_id"))
+
+# load every author in one batched query instead of one query per model
+# keyset pagination on the primary key: bounded work per page, no OFFSET scan
+_STMT_MODELS_PAGE = select(MLModelDB).options(
+    _MODEL_RESPONSE_COLUMNS,
+    selectinload(MLModelDB.author).load_only(UserDB.username),
+    raiseload("*")
+).order_by(MLModelDB.id)
+
+# Postgres builds the JSON, the JSONB columns already match ModelVerResponse
+_STMT_VER_JSON_BY_ID = text(
+    "SELECT CAST(to_jsonb(mv) AS text) FROM model_versions mv "
+    "WHERE mv.model_id = :model_id AND mv.id = :version_id"
+)
+_STMT_VERS_JSON_BY_MODEL = text(
+    "SELECT CAST(to_jsonb(mv) AS text) FROM model_versions mv "
+    "WHERE mv.model_id = :model_id"
+).execution_options(yield_per=STREAM_BATCH_SIZE)
+
+# PATCH as a single UPDATE ... RETURNING: no load before the write and no refresh after it
+# (bind names can't clash with the SET columns, hence match_*)
+# each request's session starts empty, so there are no in-session objects to synchronize
+_STMT_UPDATE_MODEL = update(MLModelDB).where(
+    MLModelDB.id == bindparam("match_model_id")
+).returning(MLModelDB).execution_options(synchronize_session=False)
+
+_STMT_UPDATE_VER = update(ModelVersionDB).where(
+    ModelVersionDB.model_id == bindparam("match_model_id"),
+    ModelVersionDB.id == bindparam("match_version_id")
+).returning(ModelVersionDB).execution_options(synchronize_session=False)
+
 
 # Initialize App
 app = FastAPI(
     title="Pocket AI Lab API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     openapi_tags = [
         {
             "name": "Users",
@@ -158,38 +322,56 @@ app = FastAPI(
 )
 
 # CORS
-origins = [
+# Explicit, immutable allow-lists (no "*"), so Starlette precomputes the headers once
+# instead of reflecting the request's method/headers on every call
+origins = (
     "http://localhost:5173",
     "http://127.0.0.1:5173",
     "http://localhost:5174",
     "http://127.0.0.1:5174",
     "http://localhost:3000",
     "http://127.0.0.1:3000",
-]
+)
+cors_methods = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+cors_headers = ("Content-Type", "Authorization")
+cors_expose_headers = cors_headers + ("ETag",)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
-    expose_headers=["Content-Type", "Authorization"],
-    max_age=3600,
+    allow_methods=cors_methods,
+    allow_headers=cors_headers,
+    expose_headers=cors_expose_headers,
+    max_age=86400,  # let browsers cache preflights for a day
 )
 
+@app.on_event("startup")
+async def configure_threadpool():
+    """Size the threadpool used for sync handlers and blocking calls offloaded off the event loop."""
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_TOKENS
+
 # ==========================================
 # SCHEDULER SETUP
 # ==========================================
-# Initialize the background scheduler for HuggingFace model sync
-scheduler = BackgroundScheduler()
+# Initialize the scheduler for HuggingFace model sync on the app's event loop
+# (no extra scheduler thread competing with request handlers)
+scheduler = AsyncIOScheduler()
+
+async def run_sync_job():
+    """Scheduled entry point: run the blocking HF sync in a worker thread so the event loop stays free."""
+    try:
+        await to_thread.run_sync(run_sync)
+    except SyncAlreadyRunning:
+        pass  # another worker's scheduler got there first, nothing to do (run_sync logged it)
 
 @app.on_event("startup")
-def start_scheduler():
-    """Start the background scheduler when FastAPI starts."""
+async def start_scheduler():
+    """Start the scheduler when FastAPI starts."""
     if not scheduler.running:
         # Schedule the HF sync job to run daily at 2 AM UTC
         scheduler.add_job(
-            run_sync,
+            run_sync_job,
             CronTrigger(hour=2, minute=0),  # 2 AM UTC daily
             id='hf_litert_sync',
             name='HuggingFace LiteRT Model Sync',
@@ -206,17 +388,71 @@ def stop_scheduler():
         scheduler.shutdown()
         logger.info("Background scheduler shut down")
 
-# 1. Cache the valid tasks from HF (Refresh once per day/hour)
-@lru_cache(maxsize=1)
-def get_valid_hf_tasks():
+# 1. Cache the valid tasks from HF (Refresh once per day)
+# stale-while-revalidate: an expired list is still served while one background thread refreshes it
+HF_TASKS_URL = "https://huggingface.co/api/tasks"
+HF_TASKS_TTL_SECONDS = 24 * 60 * 60
+HF_TASKS_RETRY_SECONDS = 60  # after a failed fetch, HF isn't asked again for this long
+_hf_tasks_cache = TTLCache(max_size=1)  # HF_TASKS_URL -> frozenset of task ids
+_hf_tasks_failed_at = float("-inf")  # last failed fetch
+_hf_tasks_lock = threading.Lock()  # guards _hf_tasks_failed_at
+_hf_tasks_refresh_lock = threading.Lock()  # single-flight guard, only one fetch at a time
+
+def _fetch_hf_tasks() -> Optional[frozenset]:
+    """Download the HF task IDs, None on failure so a bad fetch is never cached."""
     try:
-        resp = requests.get("https://huggingface.co/api/tasks")
+        resp = HF_SESSION.get(HF_TASKS_URL, timeout=10)
         if resp.status_code == 200:
             # Returns a dict where keys are task IDs
-            return set(resp.json().keys())
-    except:
-        pass
-    return set() # Fallback
+            return frozenset(resp.json().keys())
+        logger.warning(f"Could not fetch HF tasks: HTTP {resp.status_code}")
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"Could not fetch HF tasks: {e}")
+    return None
+
+def _refresh_hf_tasks() -> None:
+    """Fetch and store the task list, caller must hold _hf_tasks_refresh_lock (released here)."""
+    global _hf_tasks_failed_at
+    try:
+        tasks = _fetch_hf_tasks()
+        if tasks is not None:
+            _hf_tasks_cache.set(HF_TASKS_URL, tasks)
+        else:
+            with _hf_tasks_lock:
+                _hf_tasks_failed_at = time.monotonic()
+    finally:
+        _hf_tasks_refresh_lock.release()
+
+def get_valid_hf_tasks() -> Optional[frozenset]:
+    """Valid HF task IDs, or None while HF is unreachable and nothing has been cached yet."""
+    cached = _hf_tasks_cache.get_with_age(HF_TASKS_URL)
+    with _hf_tasks_lock:
+        failed_at = _hf_tasks_failed_at
+    now = time.monotonic()
+    backing_off = now - failed_at < HF_TASKS_RETRY_SECONDS
+
+    if cached is not None:
+        tasks, age = cached
+        # expired: serve the stale list now, refresh in the background unless a refresh is already running
+        if age > HF_TASKS_TTL_SECONDS and not backing_off and _hf_tasks_refresh_lock.acquire(blocking=False):
+            threading.Thread(target=_refresh_hf_tasks, name="hf-tasks-refresh", daemon=True).start()
+        return tasks
+
+    # HF failed a moment ago: don't make this request wait on another timeout
+    if backing_off:
+        return None
+
+    # cold miss: block on the fetch, concurrent callers wait for the same fetch instead of stampeding HF
+    _hf_tasks_refresh_lock.acquire()
+    tasks = _hf_tasks_cache.get(HF_TASKS_URL, float("inf"))
+    with _hf_tasks_lock:
+        failed_at = _hf_tasks_failed_at
+    # the fetch we queued behind finished: use its result (the list, or None if it failed) instead of fetching again
+    if tasks is not None or failed_at >= now:
+        _hf_tasks_refresh_lock.release()
+        return tasks
+    _refresh_hf_tasks()
+    return _hf_tasks_cache.get(HF_TASKS_URL, float("inf")) # None on failure, retried after HF_TASKS_RETRY_SECONDS
 
 ### user endpoints
 # user get
@@ -228,74 +464,98 @@ async def get_user(current_user: UserDB = Depends(get_current_user)):
 ### model endpoints
 # get a particular model
 @app.get("/models/{model_id}", response_model=ModelResponse, tags=["Models"], summary="Get a model summary by ID")
-async def get_model(model_id: uuid.UUID, session: Session = Depends(get_session)):
-    model_fetch = session.get(MLModelDB, model_id)
+async def get_model(model_id: uuid.UUID, request: Request, session: AsyncSession = Depends(get_session)):
+    model_fetch = (await session.exec(_STMT_MODEL_BY_ID, params={"model_id": model_id})).one_or_none()
     if not model_fetch:
         raise HTTPException(status_code=404, detail="Model not found")
-    return ModelResponse(**model_fetch.model_dump(),
-        author_username=model_fetch.author.username)
+    return cached_json_response(request, _JSON_ENCODER.encode(to_model_response(model_fetch)))
 
 # get all models
-@app.get("/models", response_model=List[ModelResponse], tags=["Models"], summary="Get all model summaries")
+@app.get("/models", response_model=ModelPage, tags=["Models"], summary="Get all model summaries")
 async def get_all_models(author_id: uuid.UUID | None = None,
-                         session: Session = Depends(get_session)):
-    statement = select(MLModelDB)
+                         after: uuid.UUID | None = None,
+                         limit: int = Query(50, ge=1, le=200),
+                         session: AsyncSession = Depends(get_session)):
+    # the optional filters change the SQL shape, so they're added on top of the shared base
+    statement = _STMT_MODELS_PAGE.limit(limit)
     if author_id:
         statement = statement.where(MLModelDB.author_id == author_id)
-    models = session.exec(statement).all()
-    return models
+    if after:
+        statement = statement.where(MLModelDB.id > after)
+    # stream rows in batches; the query is started here so DB errors still
+    # surface as a normal 500 (the session stays open until the body is sent)
+    result = await session.stream_scalars(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+    async def encode_page():
+        yield b'{"items":['
+        separator = b""
+        count = 0
+        last_id = None
+        async for batch in result.partitions():
+            # rows come straight from the DB, so build the DTOs without re-validating every field
+            # encode the batch as one array and strip its brackets to splice it into "items"
+            yield separator + _JSON_ENCODER.encode([to_model_response(m) for m in batch])[1:-1]
+            separator = b","
+            count += len(batch)
+            last_id = batch[-1].id
+        # a full page means there may be more rows after it
+        next_cursor = last_id if count == limit else None
+        yield b'],"next":' + _JSON_ENCODER.encode(next_cursor) + b"}"
+
+    return StreamingResponse(encode_page(), media_type="application/json")
 
 # model post
 @app.post("/models/{model_id}", response_model=ModelResponse, tags=["Models"], summary="Create a new model")
 async def create_model(model_id: uuid.UUID,
                        model_data: ModelCreate,
                        current_user: UserDB = Depends(get_current_user),
-                       session: Session = Depends(get_session)):
-    model_fetch = session.get(MLModelDB, model_id)
-    if model_fetch:
-        raise HTTPException(status_code=409, detail="Model already exists")
+                       session: AsyncSession = Depends(get_session)):
     # check if model task is a valid HF task, and warn if not
-    valid_tasks = get_valid_hf_tasks()
-    if model_data.task not in valid_tasks:
+    # the first call hits HF over the network, keep it off the event loop
+    valid_tasks = await run_in_threadpool(get_valid_hf_tasks)
+    # None means HF couldn't be reached, so the task can't be judged either way
+    if valid_tasks is not None and model_data.task not in valid_tasks:
         # Soft Warning
-        print(f"Warning: Unknown task '{model_data.task}'. Accepted anyway.")
-
-    # add model_id to model_data
-    model_data.id = model_id
-    session.add(model_data)
+        logger.debug(f"Unknown task '{model_data.task}'. Accepted anyway.")
+
+    # build the row through MLModelDB so the column defaults are applied, then
+    # check-and-insert in one statement: a conflicting id just returns no row
+    sent_fields = {key: value for key in model_data.model_fields_set if (value := getattr(model_data, key)) is not None}
+    new_model = MLModelDB(**sent_fields, id=model_id, author_id=current_user.id)
+    statement = pg_insert(MLModelDB).values(**column_values(new_model)).on_conflict_do_nothing(
+        index_elements=["id"]
+    ).returning(MLModelDB)
     try:
-        session.commit()
+        created_model = (await session.execute(statement)).scalar_one_or_none()
+        if created_model is None:
+            raise HTTPException(status_code=409, detail="Model already exists")
+        await session.commit()
     # throw a helpful conflict error if you try to write a value that already exists for a unique field
     except sqlalchemy.exc.IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=409, detail=str(e))
-    session.refresh(model_data)
-    return model_data
+    return created_model
 
 # model update
 @app.patch("/models/{model_id}", response_model=ModelResponse, tags=["Models"], summary="Update a model via patch")
 async def update_model(model_id: uuid.UUID,
                        model_data: ModelUpdate,
                        current_user: UserDB = Depends(get_current_user),
-                       session: Session = Depends(get_session)):
-    # check if model exists
-    model_fetch = session.get(MLModelDB, model_id)
-    if not model_fetch:
-        raise HTTPException(status_code=404, detail="Model not found")
-    # update model data
-    model_data = model_data.model_dump(exclude_unset=True)
-    
-    for key, value in model_data.items():
-        setattr(model_fetch, key, value)
-
-    session.add(model_fetch)
+                       session: AsyncSession = Depends(get_session)):
+    # update model data, an empty patch still needs one SET column to return the row
+    values = update_values(model_data, _MODEL_UPDATE_KEYS) or {"id": MLModelDB.id}
     try:
-        session.commit()
+        model_fetch = (await session.execute(
+            _STMT_UPDATE_MODEL.values(**values), {"match_model_id": model_id}
+        )).scalar_one_or_none()
+        # no row updated means the model doesn't exist
+        if model_fetch is None:
+            raise HTTPException(status_code=404, detail="Model not found")
+        await session.commit()
     # throw a helpful conflict error if you try to write a value that already exists for a unique field
     except sqlalchemy.exc.IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=409, detail=str(e))
-    session.refresh(model_fetch)
     return model_fetch
 
 ### model version endpoints
@@ -303,25 +563,30 @@ async def update_model(model_id: uuid.UUID,
 @app.get("/models/{model_id}/versions/{version_id}", response_model=ModelVerResponse, tags=["Model Versions"], summary="Get a model version summary by ID")
 async def get_model_version(model_id: uuid.UUID, 
                             version_id: uuid.UUID,
-                            session: Session = Depends(get_session)):
-    # check if model version even exists
-    statement = select(ModelVersionDB).where(
-        ModelVersionDB.model_id == model_id,
-        ModelVersionDB.id == version_id
-    )
-    model_ver = session.exec(statement).one()
-    if not model_ver:
+                            request: Request,
+                            session: AsyncSession = Depends(get_session)):
+    # let Postgres build the JSON, so there's no need to hydrate an ORM row and re-serialize it
+    model_ver_json = (await session.execute(
+        _STMT_VER_JSON_BY_ID, {"model_id": model_id, "version_id": version_id}
+    )).scalar_one_or_none()
+    if model_ver_json is None:
         raise HTTPException(status_code=404, detail="Model version not found")
-    # return model version data
-    return model_ver
+    # return model version data as-is (bypasses response_model validation)
+    return cached_json_response(request, model_ver_json)
 
 # get all of a model's versions
 @app.get("/models/{model_id}/versions", response_model=List[ModelVerResponse], tags=["Model Versions"], summary="Get all model version summaries")
 async def get_all_versions(model_id: uuid.UUID,
-                           session: Session = Depends(get_session)):
-    statement = select(ModelVersionDB).where(ModelVersionDB.model_id == model_id)
-    model_versions = session.exec(statement).all()
-    return model_versions
+                           session: AsyncSession = Depends(get_session)):
+    # same as get_model_version: Postgres builds each row's JSON, so the JSONB bytes
+    # go straight into the response without being parsed in Python
+    result = await session.stream_scalars(_STMT_VERS_JSON_BY_MODEL, {"model_id": model_id})
+
+    async def encode_rows():
+        async for model_ver_json in result:
+            yield model_ver_json.encode()
+
+    return StreamingResponse(stream_json_array(encode_rows()), media_type="application/json")
 
 # model version post
 @app.post("/models/{model_id}/versions/{version_id}", response_model=ModelVerResponse, tags=["Model Versions"], summary="Create a new model version")
@@ -329,26 +594,23 @@ async def create_model_version(model_id: uuid.UUID,
                                version_id: uuid.UUID,
                                model_ver_data: ModelVersionDB,
                                current_user: UserDB = Depends(get_current_user),
-                               session: Session = Depends(get_session)):
-    # check if model version already exists
-    statement = select(ModelVersionDB).where(
-        ModelVersionDB.model_id == model_id,
-        ModelVersionDB.id == version_id
-    )
-    model_ver = session.exec(statement).all()
-    if model_ver:
-        raise HTTPException(status_code=409, detail="Model version already exists")
+                               session: AsyncSession = Depends(get_session)):
     model_ver_data.model_id = model_id
     model_ver_data.id = version_id
-    session.add(model_ver_data)
+    # check-and-insert in one statement: an existing version id just returns no row
+    statement = pg_insert(ModelVersionDB).values(**column_values(model_ver_data)).on_conflict_do_nothing(
+        index_elements=["id"]
+    ).returning(ModelVersionDB)
     try:
-        session.commit()
+        created_ver = (await session.execute(statement)).scalar_one_or_none()
+        if created_ver is None:
+            raise HTTPException(status_code=409, detail="Model version already exists")
+        await session.commit()
     # throw a helpful conflict error if you try to write a value that already exists for a unique field
     except sqlalchemy.exc.IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=409, detail=str(e))
-    session.refresh(model_ver_data)
-    return model_ver_data
+    return created_ver
 
 # model version update
 @app.patch("/models/{model_id}/versions/{version_id}", response_model=ModelVerResponse, tags=["Model Versions"], summary="Update a model version via patch")
@@ -356,28 +618,21 @@ async def update_model_version(model_id: uuid.UUID,
                                version_id: uuid.UUID,
                                model_ver_data: ModelVerUpdate,
                                current_user: UserDB = Depends(get_current_user),
-                               session: Session = Depends(get_session)):
-    # check if model version already exists
-    statement = select(ModelVersionDB).where(
-        ModelVersionDB.model_id == model_id,
-        ModelVersionDB.id == version_id
-    )
-    model_ver = session.exec(statement).one()
-    if not model_ver:
-        raise HTTPException(status_code=409, detail="Model version doesn't exist")
-    update_data = model_ver_data.model_dump(exclude_unset=True)
-    
-    for key, value in update_data.items():
-        setattr(model_ver, key, value)
-
-    session.add(model_ver)
+                               session: AsyncSession = Depends(get_session)):
+    # an empty patch still needs one SET column to return the row
+    values = update_values(model_ver_data, _MODEL_VER_UPDATE_KEYS) or {"id": ModelVersionDB.id}
     try:
-        session.commit()
+        model_ver = (await session.execute(
+            _STMT_UPDATE_VER.values(**values), {"match_model_id": model_id, "match_version_id": version_id}
+        )).scalar_one_or_none()
+        # no row updated means the model version doesn't exist
+        if model_ver is None:
+            raise HTTPException(status_code=404, detail="Model version not found")
+        await session.commit()
     # throw a helpful conflict error if you try to write a value that already exists for a unique field
     except sqlalchemy.exc.IntegrityError as e:
-        session.rollback()
+        await session.rollback()
         raise HTTPException(status_code=409, detail=str(e))
-    session.refresh(model_ver)
     return model_ver
 
 # Search HF for models with TFLite files
@@ -390,6 +645,109 @@ class HFSearchResult(BaseModel):
 class HFSearchResponse(BaseModel):
     results: List[HFSearchResult]
 
+# candidates fetched per search, and how many TFLite matches to return
+HF_SEARCH_CANDIDATES = 30
+HF_SEARCH_MAX_RESULTS = 15
+
+def get_tflite_search_result(repo_id: str) -> Optional[HFSearchResult]:
+    """Fetch one candidate's file listing, returns None if it has no .tflite files."""
+    # Get detailed info with file listing
+    # the filenames (siblings) come back without files_metadata, which would add LFS size/hash data for every file
+    detailed_info = HF_API.model_info(repo_id=repo_id, files_metadata=False)
+
+    # Check if it has tflite files
+    if detailed_info.siblings is None:
+        return None
+
+    tflite_files = [f for f in detailed_info.siblings if f.rfilename.endswith(".tflite")]
+    if not tflite_files:  # Only include if it has TFLite files
+        return None
+
+    # Safely extract description (cardData is a ModelCardData, dict-like but not a dict)
+    card = detailed_info.cardData
+    description = (card_str(card.get("summary")) or card_str(card.get("description"))) if card else None
+
+    return HFSearchResult(
+        id=repo_id,
+        description=description if description else "TFLite model from Hugging Face",
+        tags=detailed_info.tags or [],
+        pipeline_tag=detailed_info.pipeline_tag
+    )
+
+def search_tflite_models(query: str) -> Tuple[HFSearchResponse, bool]:
+    """
+    Run a search against HF and keep the candidates that ship .tflite files (blocking).
+    Also returns whether the response is complete, False if a candidate lookup it depends on failed.
+    """
+    # Search HF for models without framework filter to avoid auth issues
+    # The pytorch filter was too restrictive and causing rate limit issues
+    hf_models = list(HF_API.list_models(
+        search=query,
+        limit=HF_SEARCH_CANDIDATES,
+        full=False  # Don't fetch full metadata for initial search
+    ))
+
+    # Filter to only models with .tflite files
+    # the per-candidate model_info calls run in parallel instead of one HF round-trip after another
+    futures = {
+        HF_EXECUTOR.submit(get_tflite_search_result, model_info.id): rank
+        for rank, model_info in enumerate(hf_models)
+    }
+    # keep HF's relevance order: the answer is the first HF_SEARCH_MAX_RESULTS matches by rank,
+    # so stop only once every candidate ranked above the last of them has finished
+    results: List[Optional[HFSearchResult]] = [None] * len(hf_models)
+    finished = [False] * len(hf_models)
+    failed = [False] * len(hf_models)
+    decided = 0  # candidates [0, decided) are finished, in rank order
+    matches = 0  # matches among them
+    complete = True  # no lookup among them failed
+    for future in as_completed(futures):
+        rank = futures[future]
+        try:
+            results[rank] = future.result()
+        except Exception as e:
+            # Log but skip models that fail to load details
+            # Common issues: private models, API timeouts, etc.
+            failed[rank] = True
+        finished[rank] = True
+        while decided < len(hf_models) and finished[decided] and matches < HF_SEARCH_MAX_RESULTS:
+            if results[decided] is not None:
+                matches += 1
+            if failed[decided]:
+                complete = False
+            decided += 1
+        # Limit results to avoid too many API calls
+        if matches >= HF_SEARCH_MAX_RESULTS:
+            break
+    # drop the lower-ranked candidates that haven't started yet
+    for future in futures:
+        future.cancel()
+
+    return HFSearchResponse(results=[result for result in results[:decided] if result is not None]), complete
+
+# Search results cache (stale-while-revalidate)
+# fresh for 10 min, then served stale for up to an hour while one background refresh runs
+HF_SEARCH_TTL_SECONDS = 600
+HF_SEARCH_STALE_SECONDS = 3600
+HF_SEARCH_CACHE_MAX_SIZE = 1000
+_hf_search_cache = TTLCache(max_size=HF_SEARCH_CACHE_MAX_SIZE)  # normalized query -> HFSearchResponse
+_hf_search_refreshing: set = set()  # queries with a refresh in flight
+_hf_search_lock = threading.Lock()  # guards _hf_search_refreshing
+# refreshes get their own workers, they fan out on HF_EXECUTOR and must not wait on their own pool
+HF_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hf-refresh")
+
+def refresh_search_response(cache_key: str, query: str) -> None:
+    """Background refresh of a stale search, failures (or partial results) keep serving the stale entry."""
+    try:
+        response, complete = search_tflite_models(query)
+        if complete:
+            _hf_search_cache.set(cache_key, response)
+    except Exception as e:
+        logger.warning(f"Background refresh of HF search '{query}' failed: {e}")
+    finally:
+        with _hf_search_lock:
+            _hf_search_refreshing.discard(cache_key)
+
 @app.get("/search/huggingface", response_model=HFSearchResponse, tags=["Hugging Face"], summary="Search Hugging Face for TFLite models")
 def search_huggingface(query: str, 
                        ):
@@ -400,61 +758,27 @@ def search_huggingface(query: str,
     if not query or len(query.strip()) < 2:
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters")
     
+    cache_key = query.strip().lower()
+    cached = _hf_search_cache.get_with_age(cache_key)
+    if cached:
+        response, age = cached
+        if age < HF_SEARCH_TTL_SECONDS:
+            return response
+        if age < HF_SEARCH_STALE_SECONDS:
+            # serve stale now, refresh once in the background
+            with _hf_search_lock:
+                start_refresh = cache_key not in _hf_search_refreshing
+                _hf_search_refreshing.add(cache_key)
+            if start_refresh:
+                HF_REFRESH_EXECUTOR.submit(refresh_search_response, cache_key, query)
+            return response
+
     try:
-        # Use HF token if available from environment
-        hf_token = os.getenv("HUGGINGFACE_TOKEN")
-        if hf_token:
-            api = HfApi(token=hf_token) 
-            print("Searching HuggingFace using token")
-        else:
-            api = HfApi()
-            print("Searching HuggingFace without token")
-        
-        # Search HF for models without framework filter to avoid auth issues
-        # The pytorch filter was too restrictive and causing rate limit issues
-        hf_models = api.list_models(
-            search=query,
-            limit=30,
-            full=False  # Don't fetch full metadata for initial search
-        )
-        
-        results = []
-        
-        # Filter to only models with .tflite files
-        for model_info in hf_models:
-            try:
-                # Get detailed info with file listing
-                detailed_info = api.model_info(repo_id=model_info.id, files_metadata=True)
-                
-                # Check if it has tflite files
-                if detailed_info.siblings is None:
-                    continue
-                    
-                tflite_files = [f for f in detailed_info.siblings if f.rfilename.endswith(".tflite")]
-                
-                if tflite_files:  # Only include if it has TFLite files
-                    # Safely extract description
-                    description = ""
-                    if detailed_info.cardData and isinstance(detailed_info.cardData, dict):
-                        description = detailed_info.cardData.get("summary", "") or detailed_info.cardData.get("description", "")
-                    
-                    results.append(HFSearchResult(
-                        id=model_info.id,
-                        description=description if description else "TFLite model from Hugging Face",
-                        tags=detailed_info.tags or [],
-                        pipeline_tag=detailed_info.pipeline_tag
-                    ))
-                    
-                    # Limit results to avoid too many API calls
-                    if len(results) >= 15:
-                        break
-                        
-            except Exception as e:
-                # Log but skip models that fail to load details
-                # Common issues: private models, API timeouts, etc.
-                continue
-        
-        return HFSearchResponse(results=results)
+        response, complete = search_tflite_models(query)
+        # a response missing failed lookups (an HF outage) isn't cached, or it would be served for up to an hour
+        if complete:
+            _hf_search_cache.set(cache_key, response)
+        return response
         
     except requests.exceptions.ConnectionError:
         raise HTTPException(status_code=503, detail="Unable to connect to Hugging Face. Please check your internet connection and try again.")
@@ -470,16 +794,15 @@ def search_huggingface(query: str,
 
 # create a model from HF
 @app.post("/import/huggingface", response_model=ModelResponse, tags=["Hugging Face"], summary="Import a model directly from Hugging Face")
-def import_from_huggingface(
+async def import_from_huggingface(
     payload: HFImportRequest,
     user: UserDB = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
-    api = HfApi()
-    
     # 1. Fetch Model Info from HF
+    # HfApi is blocking, so run it in the threadpool instead of on the event loop
     try:
-        model_info = api.model_info(repo_id=payload.hf_id, files_metadata=True)
+        model_info = await run_in_threadpool(HF_API.model_info, repo_id=payload.hf_id, files_metadata=True)
     except Exception:
         raise HTTPException(status_code=404, detail="Hugging Face repo not found")
 
@@ -494,9 +817,8 @@ def import_from_huggingface(
     hf_tags = model_info.tags or []
     #our_tags = [t for t in hf_tags if t in ["vision", "audio", "text"]] # Simple filter
     
-    # Map License (data schema uses HF's license strings directly)
-    license_str = model_info.cardData.get("license", "unknown")
-    license_enum = LicenseType(license_str) if license_str in LicenseType.__members__ else LicenseType.UNKNOWN
+    # Map License (data schema uses HF's license strings directly), normalized the same way as the sync
+    license_enum = map_hf_license_to_enum(card_str(model_info.cardData.get("license")) if model_info.cardData else None)
     
     new_model = MLModelDB(
         name=payload.hf_id.title(), # "mobilenet-v2"
@@ -546,8 +868,13 @@ def import_from_huggingface(
     # )
 
     # session.add(new_version)
-    # session.commit()
-    session.refresh(new_model)
+    try:
+        await session.commit()
+    # already imported (or synced), or its slug is taken: same conflict error as the other write endpoints
+    except sqlalchemy.exc.IntegrityError as e:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail=str(e))
+    await session.refresh(new_model)
     
     return new_model
 
@@ -559,6 +886,7 @@ class SyncResponse(BaseModel):
     status: str
     created: int
     updated: int
+    unchanged: int = 0
     skipped: int
     message: str
 
@@ -578,9 +906,12 @@ def manual_sync_literrt_models(current_user: UserDB = Depends(get_current_user))
             status="success",
             created=stats.get("created", 0),
             updated=stats.get("updated", 0),
+            unchanged=stats.get("unchanged", 0),
             skipped=stats.get("skipped", 0),
-            message=f"Successfully synced LiteRT models. Created: {stats.get('created', 0)}, Updated: {stats.get('updated', 0)}, Skipped: {stats.get('skipped', 0)}"
+            message=f"Successfully synced LiteRT models. Created: {stats.get('created', 0)}, Updated: {stats.get('updated', 0)}, Unchanged: {stats.get('unchanged', 0)}, Skipped: {stats.get('skipped', 0)}"
         )
+    except SyncAlreadyRunning as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         logger.error(f"Error during manual sync: {e}")
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
@@ -1,12 +1,24 @@
 import os
+import logging
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
-from sqlmodel import Session
+from fastapi.concurrency import run_in_threadpool
+from jose import jwt, jwk, JWTError
+from jose.backends.base import Key
+from sqlmodel.ext.asyncio.session import AsyncSession
 from database import get_session
-from schema import UserDB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from schema import UserDB, utc_now
+from config import get_settings
+from cache import TTLCache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # ==========================================
 # CONFIG
@@ -19,13 +31,74 @@ ALGORITHMS = ["HS256", "RS256", "ES256"]
 
 security = HTTPBearer()
 
+# Verification keys are parsed into key objects once, not on every jwt.decode call
+# Symmetric (HS256) key built from the project's JWT secret
+HS_KEY = jwk.construct(settings.SUPABASE_JWT_SECRET, "HS256")
+
+# JWKS cache: keys by 'kid', refreshed hourly or when a token names a kid we haven't seen (key rotation)
+JWKS_TTL_SECONDS = 3600
+JWKS_MIN_REFETCH_SECONDS = 30  # unknown kids can't force a fetch more often than this
+JWKS_TIMEOUT_SECONDS = 2
+
+_JWKS_CACHE: Dict[str, Key] = {}  # parsed public keys by kid
+_JWKS_FETCHED_AT: float = float("-inf")  # never fetched (monotonic time can be near 0 right after boot)
+_JWKS_FAILED_AT: float = float("-inf")  # last failed fetch
+_JWKS_LOCK = threading.Lock()
+
+# kept-alive connection to Supabase for the refreshes
+JWKS_SESSION = requests.Session()
+JWKS_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+JWKS_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Verified users by 'sub', so most authenticated requests don't need a users-table lookup
+# Short TTL: changes made to a user row elsewhere show up within a minute
+USER_CACHE_TTL_SECONDS = 60
+USER_CACHE_MAX_SIZE = 10_000
+_USER_CACHE = TTLCache(max_size=USER_CACHE_MAX_SIZE)  # user_id -> UserDB
+
+def get_cached_user(user_id: str) -> Optional[UserDB]:
+    return _USER_CACHE.get(user_id, USER_CACHE_TTL_SECONDS)
+
+def cache_user(user_id: str, user: UserDB) -> None:
+    _USER_CACHE.set(user_id, user)
+
 # ==========================================
 # HELPER: FETCH PUBLIC KEYS
 # ==========================================
-def get_public_key(token: str) -> Optional[Dict[str, Any]]:
+# (kty, crv) -> algorithm, for JWKs that don't name their 'alg'
+_JWK_DEFAULT_ALGS = {
+    ("RSA", None): "RS256",
+    ("EC", "P-256"): "ES256",
+    ("EC", "P-384"): "ES384",
+    ("EC", "P-521"): "ES512",
+}
+
+def construct_public_key(key_data: Dict[str, Any]) -> Optional[Key]:
+    """
+    Parses one JWK from the JWKS into a key object (cryptography backend), None if unsupported.
+    """
+    try:
+        # 'alg' is optional in a JWK, fall back to the algorithm its key type/curve implies
+        algorithm = key_data.get("alg") or _JWK_DEFAULT_ALGS.get((key_data.get("kty"), key_data.get("crv")))
+        return jwk.construct(key_data, algorithm)
+    except Exception as e:
+        logger.warning(f"Skipping JWK {key_data.get('kid')}: {e}")
+        return None
+
+def get_cached_public_key(kid: str) -> Optional[Key]:
     """
-    Downloads the Public Key (JWK) from Supabase that matches the token's 'kid'.
+    Returns the cached Public Key for 'kid' if the JWKS is still fresh, without any I/O.
+    """
+    if time.monotonic() - _JWKS_FETCHED_AT < JWKS_TTL_SECONDS:
+        return _JWKS_CACHE.get(kid)
+    return None
+
+def get_public_key(token: str) -> Optional[Key]:
     """
+    Returns the Public Key from Supabase's JWKS that matches the token's 'kid'.
+    Served from the cache, the JWKS is only downloaded when it expired or the kid is unknown.
+    """
+    global _JWKS_CACHE, _JWKS_FETCHED_AT, _JWKS_FAILED_AT
     try:
         header = jwt.get_unverified_header(token)
         kid = header.get("kid")
@@ -33,12 +106,33 @@ def get_public_key(token: str) -> Optional[Dict[str, Any]]:
         if not kid:
             return None # If no 'kid', it might be an HS256 token (Symmetric)
 
-        # In production, you should cache this request!
-        jwks = requests.get(JWKS_URL).json()
-        
-        for key in jwks.get("keys", []):
-            if key.get("kid") == kid:
+        key = get_cached_public_key(kid)
+        if key:
+            return key
+
+        # single-flight: one thread refetches, the others wait and then re-check the cache
+        with _JWKS_LOCK:
+            key = get_cached_public_key(kid)
+            if key:
                 return key
+            # failed fetches count too, so an IdP outage costs one timeout per interval, not one per request
+            age = time.monotonic() - max(_JWKS_FETCHED_AT, _JWKS_FAILED_AT)
+            if age >= JWKS_MIN_REFETCH_SECONDS:
+                try:
+                    jwks = JWKS_SESSION.get(JWKS_URL, timeout=JWKS_TIMEOUT_SECONDS).json()
+                    # build the new mapping first, readers outside the lock keep using the old one
+                    parsed_keys = {}
+                    for key_data in jwks.get("keys", []):
+                        parsed_key = construct_public_key(key_data) if key_data.get("kid") else None
+                        if parsed_key is not None:
+                            parsed_keys[key_data["kid"]] = parsed_key
+                    _JWKS_CACHE = parsed_keys
+                    _JWKS_FETCHED_AT = time.monotonic()
+                except Exception as e:
+                    _JWKS_FAILED_AT = time.monotonic()
+                    logger.warning(f"Could not fetch JWKS, keeping the cached keys: {e}")
+            # after a failed (or skipped) fetch the cached keys are served even past their TTL
+            return _JWKS_CACHE.get(kid)
     except Exception as e:
         print(f"[AUTH ERROR] Could not fetch JWKS: {e}")
     return None
@@ -48,7 +142,7 @@ def get_public_key(token: str) -> Optional[Dict[str, Any]]:
 # ==========================================
 async def get_current_user(
     creds: HTTPAuthorizationCredentials = Depends(security), 
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> UserDB:
     
     token = creds.credentials
@@ -61,22 +155,27 @@ async def get_current_user(
 
     try:
         # 1. Try to find a Public Key (ES256 / RS256)
-        key = get_public_key(token)
+        # Cached keys are read on the event loop, only a JWKS download (a blocking HTTP call)
+        # goes to the threadpool. HS256 tokens carry no 'kid' and skip the lookup entirely
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid:
+            key = get_cached_public_key(kid) or await run_in_threadpool(get_public_key, token)
+        else:
+            key = None
         
         if key:
             # Case A: Asymmetric (ES256) -> Verify with Public Key
             payload = jwt.decode(
                 token, 
-                key, # Pass the JWK dict directly
+                key, # Pass the parsed key object directly
                 algorithms=ALGORITHMS, 
                 audience="authenticated"
             )
         else:
-            # Case B: Symmetric (HS256) -> Verify with Secret String
-            secret = os.getenv("SUPABASE_JWT_SECRET")
+            # Case B: Symmetric (HS256) -> Verify with the prebuilt secret key
             payload = jwt.decode(
                 token, 
-                secret, 
+                HS_KEY, 
                 algorithms=ALGORITHMS, 
                 audience="authenticated"
             )
@@ -91,19 +190,29 @@ async def get_current_user(
         print(f"[AUTH ERROR] Token verification failed: {e}")
         raise credentials_exception
 
-    # 2. Database Lookup
-    user = session.get(UserDB, user_id)
+    # 2. Database Lookup (skipped while the user is cached)
+    user = get_cached_user(user_id)
+    if user:
+        return user
+    user = await session.get(UserDB, user_id)
 
     if not user:
-        user = UserDB(
+        # First request for this Supabase user: register them in one INSERT ... RETURNING.
+        # Two concurrent first requests can't both insert, the loser reads the winner's row
+        statement = pg_insert(UserDB).values(
             id=user_id,
             email=email,
             username=email.split("@")[0] if email else "unknown",
             is_developer=False,
-            created_at=payload.get("created_at")
-        )
-        session.add(user)
-        session.commit()
-        session.refresh(user)
+            created_at=payload.get("created_at") or utc_now()
+        ).on_conflict_do_nothing().returning(UserDB)
+        user = (await session.execute(statement)).scalar_one_or_none()
+        await session.commit()
+        if not user:
+            user = await session.get(UserDB, user_id)
+        # the conflict was on another user's username/email, not on this id
+        if not user:
+            raise HTTPException(status_code=409, detail="Could not register user: username or email already taken")
 
+    cache_user(user_id, user)
     return user
\ No newline at end of file
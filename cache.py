@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small in-process cache shared by auth and api (users, HF tasks, HF searches).
+    Entries remember when they were stored, callers decide how old is too old.
+    At max_size the oldest entry is evicted. Safe to use from several threads.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}  # key -> (value, stored_at)
+        self._lock = threading.Lock()
+
+    def get_with_age(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """(value, age in seconds) for key, or None if it isn't cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        return value, time.monotonic() - stored_at
+
+    def get(self, key: Hashable, max_age: float) -> Optional[Any]:
+        """The value for key if it was stored less than max_age seconds ago, expired entries are dropped."""
+        cached = self.get_with_age(key)
+        if cached is None:
+            return None
+        value, age = cached
+        if age >= max_age:
+            self.pop(key)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            # dicts keep insertion order, so re-inserting moves the key to the back and the first key is the oldest
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_size:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (value, time.monotonic())
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
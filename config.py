@@ -23,10 +23,17 @@ class Settings(BaseSettings):
     # 2. Set Defaults (Optional)
     DEBUG: bool = False
     ENVIRONMENT: str = "production"
+    # Worker threads available to sync handlers and run_in_threadpool calls (anyio default is 40)
+    THREADPOOL_TOKENS: int = 100
+    # Per-connection cache of prepared statements on the asyncpg driver (0 disables it)
+    DB_STATEMENT_CACHE_SIZE: int = 500
 
     # Hugging Face
     HF_SYNC_FETCH_LIMIT: int
     HF_APPLICABLE_LIBRARIES: list[str]
+    HUGGINGFACE_TOKEN: str | None = None
+    # hf_model_id -> sha of the last synced revision, lets the sync skip unchanged models
+    HF_SYNC_CACHE_PATH: str = "hf_sync_cache.json"
 
 
 
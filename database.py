@@ -1,14 +1,64 @@
-from sqlmodel import create_engine, Session
+import orjson
+from sqlmodel import create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from config import get_settings
 
 # Get the Settings
 settings = get_settings()
 
+# JSONB columns (tags, pipeline_spec, assets) are encoded/decoded with orjson instead of the stdlib json
+def json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+json_deserializer = orjson.loads
+
 # Create the Engine
 # echo=True prints the raw SQL to the console (great for debugging)
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+# The sync engine is kept for scripts and the scheduled HF sync (db_init, seed_data, hf_sync)
+# It only serves one job/script at a time, so the pool stays small to leave Supabase connections for the API
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=5,
+    pool_pre_ping=True,  # the nightly sync finds idle connections dropped by Supabase, test them before use
+    pool_recycle=3600,
+    # rows per multi-row INSERT when a statement is executed with a list of rows (the HF sync upsert)
+    insertmanyvalues_page_size=500,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
+)
+
+# Async Engine for the API, so DB I/O doesn't block the event loop
+# Same database, but driven through asyncpg
+ASYNC_DATABASE_URL = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.DEBUG,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=20,
+    max_overflow=10,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
+    # Repeated statements (get_model, get_model_version, ...) are prepared once per connection
+    # and re-executed with new bind values, skipping Postgres' parse/plan step.
+    # prepared_statement_cache_size is SQLAlchemy's adapter cache, statement_cache_size is asyncpg's own
+    connect_args={
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
+)
+
+# expire_on_commit=False so objects stay readable after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
-# Dependency for FastAPI (Usage later)
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+# Dependency for FastAPI
+async def get_session():
+    async with AsyncSessionLocal() as session:
+        yield session
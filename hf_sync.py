@@ -7,16 +7,25 @@ and creates/updates corresponding model objects in Pocket AI database.
 This script is designed to run daily via APScheduler.
 """
 
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import queue
+import threading
+import time
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+from itertools import islice
 import uuid
 from datetime import datetime, timezone
 from sqlmodel import Session, select
 from huggingface_hub import HfApi
+from huggingface_hub.hf_api import ModelInfo
 import sqlalchemy
-import urllib.error
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import requests
 
-from schema import MLModelDB, UserDB, ModelCategory, LicenseType
+from schema import MLModelDB, UserDB, ModelCategory, LicenseType, utc_now
 from database import engine
 from config import get_settings
 
@@ -27,6 +36,26 @@ settings = get_settings()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One HF client for the process (api.py shares it too), token read once from settings
+# huggingface_hub keeps a keep-alive requests.Session per thread underneath it
+HF_API = HfApi(token=settings.HUGGINGFACE_TOKEN)
+
+ml_models = MLModelDB.__table__
+
+# models per upsert/transaction, also caps how many fetched models are held in memory
+SYNC_BATCH_SIZE = 500
+
+# upper bound for the list_models limit, far above the number of tflite repos on the Hub
+HF_SYNC_MAX_FETCH_LIMIT = 100_000
+
+# retries of a failed HF listing: 2s, 4s, 8s, 16s between the 5 attempts (capped at 60s)
+HF_FETCH_MAX_ATTEMPTS = 5
+HF_FETCH_BACKOFF_SECONDS = 2
+HF_FETCH_BACKOFF_MAX_SECONDS = 60
+
+# Postgres advisory lock key, so only one API worker (or script) runs the sync at a time
+SYNC_LOCK_NAME = "hf_litert_sync"
+
 
 def get_or_create_system_user(session: Session) -> UserDB:
     """
@@ -45,73 +74,217 @@ def get_or_create_system_user(session: Session) -> UserDB:
             hf_username=None
         )
         session.add(system_user)
-        session.commit()
-        session.refresh(system_user)
+        # flush, not commit: it's written in the caller's transaction along with the synced models
+        # (no refresh needed, every field we use was set here)
+        session.flush()
         logger.info(f"Created system user: {system_user.id}")
     
     return system_user
 
 
-def fetch_literrt_models(limit: int = settings.HF_SYNC_FETCH_LIMIT) -> List[Dict[str, Any]]:
+# System user id per database, so scheduled runs after the first skip the lookup
+_SYSTEM_USER_IDS: Dict[str, uuid.UUID] = {}
+
+
+def get_system_user_id(session: Session) -> uuid.UUID:
+    """Cached id of the sync system user, looked up (or created) on first use."""
+    cache_key = str(engine.url)
+    system_user_id = _SYSTEM_USER_IDS.get(cache_key)
+    if system_user_id is None:
+        system_user_id = get_or_create_system_user(session).id
+        _SYSTEM_USER_IDS[cache_key] = system_user_id
+    return system_user_id
+
+
+def card_str(value: Any) -> Optional[str]:
+    """
+    A model card field as a string: card YAML is free-form, so lists (license: [mit, apache-2.0])
+    give their first string, and anything else that isn't a string gives None.
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return next((item for item in value if isinstance(item, str)), None)
+    return None
+
+
+def normalize_model_info(model_info: ModelInfo) -> Dict[str, Any]:
+    """
+    Turn one list_models entry into the plain dict the sync consumes.
+    Pure in-memory work: cardData arrives with the listing, there is no per-model HTTP call here.
+    """
+    # Bind the card once: huggingface_hub hands it over as a ModelCardData (dict-like .get, not a dict),
+    # or None when the repo has no card
+    card = model_info.cardData
+    if card:
+        description = card_str(card.get("summary")) or card_str(card.get("description")) or ""
+        license_str = card_str(card.get("license")) or "unknown"
+    else:
+        description = ""
+        license_str = "unknown"
+
+    return {
+        "id": model_info.id,
+        "name": model_info.id.split("/")[-1],  # Use repo name
+        "description": description,
+        "tags": model_info.tags or [],
+        "task": model_info.pipeline_tag,
+        "license": license_str,
+        "sha": model_info.sha,
+    }
+
+
+def is_transient_hf_error(error: Exception) -> bool:
+    """Rate limits, HF server errors and dropped connections are worth retrying, anything else is not."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+def fetch_literrt_models(limit: int = settings.HF_SYNC_FETCH_LIMIT) -> Iterator[Dict[str, Any]]:
     """
     Fetch all public HuggingFace models with 'LiteRT' library.
     
-    Returns a list of model info dictionaries.
+    Yields one model info dictionary at a time as HF pages come in, so the
+    sync can write batches while the rest is still being fetched.
+
+    A transient HF error restarts the listing after an exponential backoff
+    (up to HF_FETCH_MAX_ATTEMPTS), models already yielded are not yielded again.
     """
-    api = HfApi()
-    models = []
-    
-    try:
-        logger.info("Starting fetch of LiteRT models from HuggingFace...")
-        
-        # Query for models with LiteRT library using the filter parameter
-        # This is more efficient than search
-        result = api.list_models(
-            filter="tflite",
-            limit=limit,
-            full=True,  # Get full metadata
-        )
-        
-        public_count = 0
-        private_count = 0
-
-        for model_info in result:
-            # Filter to only public models
-            if model_info.private:
-                private_count += 1
+    logger.info("Starting fetch of LiteRT models from HuggingFace...")
+
+    listed_ids = set()  # survives retries, so a restarted listing skips what the sync already has
+    public_count = 0
+    private_count = 0
+    attempt = 1
+
+    while True:
+        try:
+            # Query for models with LiteRT library using the filter parameter
+            # This is more efficient than search
+            result = HF_API.list_models(
+                filter="tflite",
+                limit=min(max(limit, 1), HF_SYNC_MAX_FETCH_LIMIT),  # a bad setting can't ask for 0 or unbounded pages
+                # full is still needed for sha (the unchanged check), the minimal listing leaves it out.
+                # huggingface_hub 0.19 has no expand=[...] to pick single fields (0.21+ does)
+                full=True,
+                cardData=True,  # summary/description/license are only sent when asked for
+            )
+
+            for model_info in result:
+                if model_info.id in listed_ids:
+                    continue
+                listed_ids.add(model_info.id)
+
+                # Filter to only public models
+                if model_info.private:
+                    private_count += 1
+                    continue
+                
+                # Filter to only applicable mobile-optimized models, using library or tag names
+                #if (model_info.library_name in settings.HF_APPLICABLE_LIBRARIES) or (any(lib in model_info.tags for lib in settings.HF_APPLICABLE_LIBRARIES)):
+                yield normalize_model_info(model_info)
+
+                public_count += 1
+                
+               # else:
+               #     logger.debug(f"Skipping model {model_info.id} - library '{model_info.library_name}' not in applicable list.")
+            break
+
+        except Exception as e:
+            if attempt >= HF_FETCH_MAX_ATTEMPTS or not is_transient_hf_error(e):
+                logger.error(f"Error fetching models: {e}")
+                raise
+            delay = min(HF_FETCH_BACKOFF_SECONDS * 2 ** (attempt - 1), HF_FETCH_BACKOFF_MAX_SECONDS)
+            logger.warning(f"HuggingFace API error (attempt {attempt}/{HF_FETCH_MAX_ATTEMPTS}), retrying in {delay}s: {e}")
+            time.sleep(delay)
+            attempt += 1
+
+    logger.info(f"Found {public_count} public LiteRT models after filtering, and {private_count} private models.")
+
+
+# end-of-stream marker passed through the prefetch queue, with the producer's error (or None)
+_PREFETCH_DONE = object()
+
+
+def prefetch(items: Iterable[Any], max_buffered: int = SYNC_BATCH_SIZE) -> Iterator[Any]:
+    """
+    Iterate items on a background thread, staying up to max_buffered items ahead of the consumer.
+    The HF listing keeps paging while the sync writes a batch, so a run takes about
+    max(fetch, write) instead of their sum. Errors from the producer are re-raised here.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max_buffered)
+    stop = threading.Event()  # set when the consumer is done, so a blocked producer gives up
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=1)
+                return True
+            except queue.Full:
                 continue
-            
-            # Filter to only applicable mobile-optimized models, using library or tag names
-            #if (model_info.library_name in settings.HF_APPLICABLE_LIBRARIES) or (any(lib in model_info.tags for lib in settings.HF_APPLICABLE_LIBRARIES)):
-            # Extract description safely
-            description = ""
-            if model_info.cardData and isinstance(model_info.cardData, dict):
-                description = model_info.cardData.get("summary", "") or model_info.cardData.get("description", "")
-            
-            models.append({
-                "id": model_info.id,
-                "name": model_info.id.split("/")[-1],  # Use repo name
-                "description": description,
-                "tags": model_info.tags or [],
-                "task": model_info.pipeline_tag,
-                "license": model_info.cardData.get("license", "unknown") if model_info.cardData else "unknown",
-                "sha": model_info.sha,
-            })
-
-            public_count += 1
-            
-           # else:
-           #     logger.debug(f"Skipping model {model_info.id} - library '{model_info.library_name}' not in applicable list.")
-        
-        logger.info(f"Found {public_count} public LiteRT models after filtering, and {private_count} private models. Ready for syncing.")
-        return models
-        
-    except urllib.error.HTTPError as e:
-        logger.error(f"HuggingFace API error: {e}")
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching models: {e}")
-        raise
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((_PREFETCH_DONE, e))
+            return
+        put((_PREFETCH_DONE, None))
+
+    # daemon, and not joined: it may be sleeping in a fetch retry, it exits on its next put
+    threading.Thread(target=produce, name="hf-sync-fetch", daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _PREFETCH_DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+# Bumped whenever the synced columns change, so the next run rewrites models whose sha didn't move
+# (2: description/license now come from the card, earlier runs stored the defaults)
+SYNC_CACHE_VERSION = 2
+
+
+def load_sync_cache(path: str = settings.HF_SYNC_CACHE_PATH) -> Dict[str, str]:
+    """Load the hf_model_id -> sha map from the last runs, empty if there's none (or it's unreadable/outdated)."""
+    try:
+        with open(path) as cache_file:
+            cache = json.load(cache_file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable sync cache {path}: {e}")
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != SYNC_CACHE_VERSION:
+        logger.info(f"Sync cache {path} is from an older version, every model will be rewritten")
+        return {}
+    return cache.get("shas", {})
+
+
+def save_sync_cache(synced_shas: Dict[str, str], path: str = settings.HF_SYNC_CACHE_PATH) -> None:
+    """Write the sha map atomically, so a crash mid-write can't leave a truncated cache."""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w") as cache_file:
+            json.dump({"version": SYNC_CACHE_VERSION, "shas": synced_shas}, cache_file)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write sync cache {path}: {e}")
+
+
+# LicenseType by value, built once so each mapping is a single dict lookup
+_LICENSE_LOOKUP: Dict[str, LicenseType] = {license_type.value: license_type for license_type in LicenseType}
 
 
 def map_hf_license_to_enum(license_str: str) -> str:
@@ -119,121 +292,218 @@ def map_hf_license_to_enum(license_str: str) -> str:
     if not license_str:
         return LicenseType.UNKNOWN
     
-    # Normalize the string
-    license_str = license_str.lower().strip()
-    
-    # Try direct mapping
-    for license_type in LicenseType:
-        if license_type.value == license_str:
-            return license_type
-    
-    # Fallback to UNKNOWN if no match
-    return LicenseType.UNKNOWN
+    # Normalize the string, fallback to UNKNOWN if no match
+    return _LICENSE_LOOKUP.get(license_str.lower().strip(), LicenseType.UNKNOWN)
+
+
+def upsert_model_rows(session: Session, rows: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+    """Write one batch with a single INSERT ... ON CONFLICT (hf_model_id) DO UPDATE, counting created/updated."""
+    # Core insert on the table (no ORM bulk machinery), executed with the list of rows:
+    # SQLAlchemy batches it into multi-row INSERTs of insertmanyvalues_page_size rows each
+    statement = pg_insert(ml_models)
+    statement = statement.on_conflict_do_update(
+        index_elements=[ml_models.c.hf_model_id],
+        # Update existing model with new metadata
+        set_={
+            "tags": statement.excluded.tags,
+            "task": statement.excluded.task,
+            "description": statement.excluded.description,
+            "license_type": statement.excluded.license_type,
+        },
+    ).returning(
+        ml_models.c.hf_model_id,
+        # xmax is 0 only for freshly inserted rows, updated rows carry the updating transaction id
+        sqlalchemy.literal_column("xmax = 0", type_=sqlalchemy.Boolean),
+    )
 
+    # per-row logs use lazy %s args, so nothing is formatted unless DEBUG is on
+    for hf_model_id, inserted in session.execute(statement, rows):
+        if inserted:
+            stats["created"] += 1
+            logger.debug("Created new model: %s", hf_model_id)
+        else:
+            stats["updated"] += 1
+            logger.debug("Updated model: %s", hf_model_id)
 
-def sync_literrt_models(models: List[Dict[str, Any]]) -> Dict[str, int]:
+
+# slug -> hf_model_id of the models already holding a batch's slugs, built once for every batch
+_STMT_SLUG_OWNERS = select(MLModelDB.slug, MLModelDB.hf_model_id).where(
+    MLModelDB.slug.in_(bindparam("slugs", expanding=True))
+)
+
+
+def sync_literrt_models(models: Iterable[Dict[str, Any]], synced_shas: Optional[Dict[str, str]] = None) -> Dict[str, int]:
     """
     Sync fetched LiteRT models to the database.
+    Models are consumed in batches of SYNC_BATCH_SIZE: each batch is validated in Python,
+    then written in its own short transaction with one bulk upsert. A failure rolls back
+    the current batch and is re-raised, ending the run; batches committed before it are kept.
+
+    synced_shas (hf_model_id -> sha of the last synced revision) lets models that are
+    already in the DB at the same sha be left alone; it is updated with every committed batch.
     
     Returns a dict with counts:
     - created: number of new models created
     - updated: number of existing models updated
-    - skipped: number of models skipped due to errors
+    - unchanged: number of models already in sync (same sha as the last run)
+    - skipped: number of models skipped (invalid, duplicate, or a slug already used by another model)
     """
-    with Session(engine) as session:
-        system_user = get_or_create_system_user(session)
-        stats = {"created": 0, "updated": 0, "skipped": 0}
-        
-        for model_data in models:
-            try:
-                hf_model_id = model_data["id"]
-                
-                # Check if model already exists
-                statement = select(MLModelDB).where(
-                    MLModelDB.hf_model_id == hf_model_id
-                )
-                existing_model = session.exec(statement).first()
-                
-                if existing_model:
-                    # Update existing model with new metadata
-                    existing_model.tags = model_data["tags"]
-                    existing_model.task = model_data["task"]
-                    existing_model.description = model_data["description"]
-                    session.add(existing_model)
-                    stats["updated"] += 1
-                    logger.debug(f"Updated model: {hf_model_id}")
-                    
-                else:
-                    # Create new model
-                    new_model = MLModelDB(
-                        id=uuid.uuid4(),
-                        name=model_data["name"],
-                        slug=hf_model_id.lower().replace("/", "-"),
-                        description=model_data["description"] or f"LiteRT model from HuggingFace: {hf_model_id}",
-                        category=ModelCategory.UTILITY,  # Default category
-                        license_type=map_hf_license_to_enum(model_data["license"]),
-                        origin_repo_url=f"https://huggingface.co/{hf_model_id}",
-                        hf_model_id=hf_model_id,
-                        author_id=system_user.id,
-                        tags=model_data["tags"],
-                        task=model_data["task"],
-                        is_verified_official=False,
-                        total_download_count=0,
-                        rating_weighted_avg=0.0,
-                        total_ratings=0,
-                    )
-                    session.add(new_model)
-                    stats["created"] += 1
-                    logger.debug(f"Created new model: {hf_model_id}")
-                    
-            except sqlalchemy.exc.IntegrityError as e:
-                session.rollback()
-                logger.warning(f"Integrity error for {model_data['id']}: {e}")
-                stats["skipped"] += 1
-                
-            except Exception as e:
-                session.rollback()
-                logger.error(f"Error syncing model {model_data['id']}: {e}")
-                stats["skipped"] += 1
-        
-        # Commit all changes
-        try:
-            session.commit()
-            logger.info(f"Sync completed - Created: {stats['created']}, Updated: {stats['updated']}, Skipped: {stats['skipped']}")
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error committing transaction: {e}")
-            raise
-        
-        return stats
+    stats = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    if synced_shas is None:
+        synced_shas = {}
+    skip_reasons: List[str] = []  # logged once at the end instead of per row
+    seen_ids = set()  # hf_model_ids already handled, duplicates can span batches
+    models = iter(models)
+
+    try:
+        with Session(engine) as session:
+            with session.begin():
+                # read the id inside the transaction, the commit expires the instance
+                system_user_id = get_system_user_id(session)
+            created_at = utc_now()
+
+            while batch := list(islice(models, SYNC_BATCH_SIZE)):
+                # Build plain rows (no ORM objects), keyed by hf_model_id:
+                # one statement can't insert/update the same row twice, so duplicates are dropped
+                rows: Dict[str, Dict[str, Any]] = {}
+                batch_shas: Dict[str, Optional[str]] = {}
+                for model_data in batch:
+                    hf_model_id = model_data.get("id")
+                    if not hf_model_id or not model_data.get("name"):
+                        skip_reasons.append(f"{hf_model_id!r}: missing id or name")
+                        continue
+                    if hf_model_id in seen_ids:
+                        skip_reasons.append(f"{hf_model_id}: duplicate")
+                        continue
+                    # normalize_model_info only hands out strings, other callers may not
+                    if not all(isinstance(model_data.get(key) or "", str) for key in ("description", "license")):
+                        skip_reasons.append(f"{hf_model_id}: description or license is not a string")
+                        continue
+                    seen_ids.add(hf_model_id)
+                    batch_shas[hf_model_id] = model_data.get("sha")
+                    # most HF ids are already lowercase, only lower() the ones that aren't
+                    slug = hf_model_id.replace("/", "-")
+                    if not slug.islower():
+                        slug = slug.lower()
+                    rows[hf_model_id] = {
+                        "id": uuid.uuid4(),
+                        "name": model_data["name"],
+                        "slug": slug,
+                        "description": model_data["description"] or f"LiteRT model from HuggingFace: {hf_model_id}",  # fallback only formatted when there's none
+                        "category": ModelCategory.UTILITY,  # Default category
+                        "license_type": map_hf_license_to_enum(model_data["license"]),
+                        "origin_repo_url": f"https://huggingface.co/{hf_model_id}",
+                        "hf_model_id": hf_model_id,
+                        "author_id": system_user_id,
+                        "tags": model_data["tags"],
+                        "task": model_data["task"],
+                        "is_verified_official": False,
+                        "total_download_count": 0,
+                        "rating_weighted_avg": 0.0,
+                        "total_ratings": 0,
+                        "created_at": created_at,
+                    }
+                if not rows:
+                    continue
+
+                with session.begin():
+                    # slug is unique as well, and ON CONFLICT only resolves hf_model_id clashes:
+                    # drop rows whose slug already belongs to another model (in the DB or earlier in this batch)
+                    slug_owners = dict(session.execute(
+                        _STMT_SLUG_OWNERS, {"slugs": [row["slug"] for row in rows.values()]}
+                    ).all())
+                    for hf_model_id, row in list(rows.items()):
+                        # the slug is derived from hf_model_id, so owning it also means the model is in the DB
+                        sha = batch_shas[hf_model_id]
+                        if sha and slug_owners.get(row["slug"]) == hf_model_id and synced_shas.get(hf_model_id) == sha:
+                            stats["unchanged"] += 1
+                            del rows[hf_model_id]
+                            continue
+                        owner = slug_owners.setdefault(row["slug"], hf_model_id)
+                        if owner != hf_model_id:
+                            skip_reasons.append(f"{hf_model_id}: slug '{row['slug']}' already used")
+                            del rows[hf_model_id]
+
+                    if rows:
+                        upsert_model_rows(session, list(rows.values()), stats)
+                # leaving session.begin() commits the batch, or rolls it back on an error
+                # (only committed models are remembered)
+                synced_shas.update((hf_model_id, batch_shas[hf_model_id]) for hf_model_id in rows if batch_shas[hf_model_id])
+    except Exception as e:
+        # the cached system user may be what failed (e.g. the users table was reset), look it up again next run
+        _SYSTEM_USER_IDS.pop(str(engine.url), None)
+        logger.error(f"Error committing transaction: {e}")
+        raise
+    finally:
+        stats["skipped"] = len(skip_reasons)
+        if skip_reasons:
+            logger.warning(f"Skipped {len(skip_reasons)} models: {'; '.join(skip_reasons)}")
+
+    logger.info(f"Sync completed - Created: {stats['created']}, Updated: {stats['updated']}, Unchanged: {stats['unchanged']}, Skipped: {stats['skipped']}")
+    return stats
+
+
+class SyncAlreadyRunning(Exception):
+    """Raised by run_sync when another worker (or script) holds the sync lock."""
 
 
 def run_sync(limit: int = settings.HF_SYNC_FETCH_LIMIT) -> Dict[str, int]:
     """
     Main entry point for the HuggingFace sync job.
     Fetches LiteRT models and syncs them to the database.
+    Raises SyncAlreadyRunning if a sync is already in progress elsewhere.
     """
+    # Every uvicorn worker runs its own scheduler, the advisory lock lets only one of them sync.
+    # The lock belongs to this connection, so it is also released if the process dies mid-sync
+    got_lock = False
     try:
-        logger.info("=" * 60)
-        logger.info("Starting HuggingFace LiteRT Model Sync")
-        logger.info("=" * 60)
-        
-        # Fetch models from HuggingFace
-        models = fetch_literrt_models(limit=limit)  # Adjust limit as needed
-        
-        # Sync to database
-        stats = sync_literrt_models(models)
-        
-        logger.info("=" * 60)
-        logger.info("HuggingFace LiteRT Model Sync Completed Successfully")
-        logger.info(f"Results: {stats}")
-        logger.info("=" * 60)
-        
-        return stats
-        
-    except Exception as e:
-        logger.error(f"Fatal error during sync: {e}")
-        raise
+        with engine.connect() as lock_conn:
+            got_lock = lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": SYNC_LOCK_NAME}
+            ).scalar()
+            # session-level advisory locks survive the commit: end the implicit transaction now so this
+            # connection doesn't sit idle in transaction (holding a snapshot, blocking vacuum) for the whole sync
+            lock_conn.commit()
+            if not got_lock:
+                logger.info("HuggingFace LiteRT Model Sync already running elsewhere, skipping")
+                raise SyncAlreadyRunning("HuggingFace LiteRT Model Sync is already running")
+
+            try:
+                logger.info("=" * 60)
+                logger.info("Starting HuggingFace LiteRT Model Sync")
+                logger.info("=" * 60)
+            
+                # Fetch models from HuggingFace
+                # (fetched on a background thread, so HF paging overlaps the DB writes)
+                models = prefetch(fetch_literrt_models(limit=limit))  # Adjust limit as needed
+            
+                # Sync to database, skipping models whose sha hasn't changed since the last run
+                synced_shas = load_sync_cache()
+                try:
+                    stats = sync_literrt_models(models, synced_shas)
+                finally:
+                    # also keeps the progress of committed batches if a later batch failed
+                    save_sync_cache(synced_shas)
+            
+                logger.info("=" * 60)
+                logger.info("HuggingFace LiteRT Model Sync Completed Successfully")
+                logger.info(f"Results: {stats}")
+                logger.info("=" * 60)
+            
+                return stats
+            
+            except Exception as e:
+                logger.error(f"Fatal error during sync: {e}")
+                raise
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": SYNC_LOCK_NAME})
+                lock_conn.commit()
+    finally:
+        # After a sync that ran, the next scheduled one is a day away: close the pooled connections instead
+        # of leaving them idle on Supabase, the next run starts from fresh ones.
+        # Not when the lock was busy, the pool may belong to a sync still running in this process
+        if got_lock:
+            engine.dispose()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+from collections import Counter
 from huggingface_hub import HfApi
 from huggingface_hub import ModelCard
 from tqdm import tqdm
@@ -7,18 +8,14 @@ models = api.list_models()
 card = ModelCard.load("gumbojustice/efficientnet_test")
 card2 = ModelCard.load("litert-community/DeepSeek-R1-Distill-Qwen-1.5B")
 
-libraries = {}
-tags = {}
-
-count = 0
+libraries = Counter()
+tags = Counter()
 
 for m in tqdm(models):
-    libraries[m.library_name] = libraries.get(m.library_name, 0) + 1
-    for t in m.tags:
-        tags[t] = tags.get(t, 0) + 1
-    count += 1
-
-print(f"Total models on Hugging Face Hub: {count}")
-
+    libraries[m.library_name] += 1
+    tags.update(m.tags)  # counted in C, no per-tag Python loop
 
+# every model is counted once under its library (None included)
+count = sum(libraries.values())
 
+print(f"Total models on Hugging Face Hub: {count}")
@@ -3,14 +3,16 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import List, Dict, Any, Optional
 
-from pydantic import BaseModel as PydanticBaseModel
+from pydantic import BaseModel as PydanticBaseModel, ConfigDict
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column
+from sqlalchemy import Column, DateTime, Index
 from sqlalchemy.dialects.postgresql import JSONB
 
 # ==========================================
 # 0. HELPERS
 # ==========================================
+# NOTE: utc_now() is timezone-aware, so every datetime column is declared as
+# DateTime(timezone=True) (timestamptz). asyncpg refuses aware values on plain TIMESTAMP columns.
 def utc_now():
     return datetime.now(timezone.utc)
 
@@ -71,31 +73,38 @@ class LicenseType(str, Enum):
         Helper to determine if this license generally allows commercial use.
         NOTE: This is a heuristic, not legal advice.
         """
-        SAFE_LICENSES = {
-            LicenseType.APACHE_2_0, 
-            LicenseType.MIT, 
-            LicenseType.BSD,
-            LicenseType.BSD_3_CLAUSE,
-            LicenseType.BSD_3_CLAUSE_CLEAR,
-            LicenseType.CC0_1_0,
-            LicenseType.AFL_3_0,
-            LicenseType.CC_BY_4_0, # Allowed, but requires attribution
-            LicenseType.OPENRAIL, # Usually allowed with restrictions
-            LicenseType.OPENRAIL_M,
-        }
-        return self in SAFE_LICENSES
-    
+        return self in _SAFE_LICENSES
+
+# Built once at import instead of on every is_commercial_allowed call
+_SAFE_LICENSES: frozenset[LicenseType] = frozenset({
+    LicenseType.APACHE_2_0, 
+    LicenseType.MIT, 
+    LicenseType.BSD,
+    LicenseType.BSD_3_CLAUSE,
+    LicenseType.BSD_3_CLAUSE_CLEAR,
+    LicenseType.CC0_1_0,
+    LicenseType.AFL_3_0,
+    LicenseType.CC_BY_4_0, # Allowed, but requires attribution
+    LicenseType.OPENRAIL, # Usually allowed with restrictions
+    LicenseType.OPENRAIL_M,
+})
+
 
 # ==========================================
 # 2. JSON COMPONENTS (The "Inner" Data)
 # ==========================================
 # These are used for Validation in API Requests/Responses
+# Nothing edits them after validation, so they are frozen (immutable, and hashable when their fields are)
 
 class PipelineStep(PydanticBaseModel):
+    model_config = ConfigDict(frozen=True)
+
     step_name: str
     params: Dict[str, Any] = {}
 
 class PipelineConfig(PydanticBaseModel):
+    model_config = ConfigDict(frozen=True)
+
     input_nodes: List[str]
     output_nodes: List[str]
     pre_processing: List[PipelineStep] = []
@@ -103,6 +112,8 @@ class PipelineConfig(PydanticBaseModel):
     asset_map: Dict[str, str] = {}
 
 class MLModelAsset(PydanticBaseModel):
+    model_config = ConfigDict(frozen=True)
+
     asset_key: str
     asset_type: AssetType
     source_url: str 
@@ -119,7 +130,7 @@ class UserBase(SQLModel):
     email: str = Field(index=True, unique=True)
     is_developer: bool = False
     # FIX: Use helper function for time
-    created_at: datetime = Field(default_factory=utc_now)
+    created_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
     hf_username: Optional[str] = Field(default=None, index=True)
     hf_verification_token: Optional[str] = Field(default=None)
     hf_access_token: Optional[str] = Field(default=None)
@@ -148,9 +159,12 @@ class MLModelBase(SQLModel):
 
 class MLModelDB(MLModelBase, table=True):
     __tablename__ = "ml_models"
+    # serves GET /models?author_id=... with its keyset order (author_id, then id) from one index
+    __table_args__ = (Index("ix_ml_models_author_id_id", "author_id", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     author_id: uuid.UUID = Field(foreign_key="users.id")
-    hf_model_id: Optional[str] = Field(default=None, index=True)
+    # unique: the HF sync upserts on it (ON CONFLICT (hf_model_id)), NULLs are still allowed for non-HF models
+    hf_model_id: Optional[str] = Field(default=None, index=True, unique=True)
     is_verified_official: bool = False
     
     # FIX: Use default_factory for mutable list
@@ -163,7 +177,7 @@ class MLModelDB(MLModelBase, table=True):
     total_download_count: int = 0  
     rating_weighted_avg: float = 0.0
     total_ratings: int = 0
-    created_at: datetime = Field(default_factory=utc_now)
+    created_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
     
     # Relationships
     author: UserDB = Relationship(back_populates="models")
@@ -205,7 +219,7 @@ class ModelVersionDB(ModelVersionBase, table=True):
     pipeline_spec: Dict[str, Any] = Field(sa_column=Column(JSONB))
     assets: List[Dict[str, Any]] = Field(sa_column=Column(JSONB))
     
-    published_at: datetime = Field(default_factory=utc_now)
+    published_at: datetime = Field(default_factory=utc_now, sa_type=DateTime(timezone=True))
     download_count: int = 0
     num_ratings: int = 0
     rating_avg: float = 0
@@ -238,7 +252,7 @@ class InferenceLogDB(SQLModel, table=True):
     __tablename__ = "inference_logs"
     id: Optional[int] = Field(default=None, primary_key=True) # BigInt auto-increment
     model_version_id: uuid.UUID = Field(foreign_key="model_versions.id")
-    timestamp: datetime = Field(default_factory=utc_now, index=True)
+    timestamp: datetime = Field(default_factory=utc_now, index=True, sa_type=DateTime(timezone=True))
     
     device_model: str
     platform: DevicePlatform
@@ -258,6 +272,8 @@ class InferenceLogCreate(SQLModel):
 # ==========================================
 
 class ModelManifestResponse(PydanticBaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: uuid.UUID
     name: str
     version: str